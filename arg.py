@@ -1,16 +1,50 @@
 # Command-line arguments
+#   * Imports are deferred into get_args(), so importing this module (e.g., for __version__) stays cheap
 
-import argparse
-import getpass
-import os
+from functools import cache
 
 __version__ = "1.0.0"
 
+class UserPath:
+    """Default path containing "$USER", resolved (user name lookup) only when used or shown in help."""
+    
+    def __init__(self, template):
+        self.template = template
+    
+    def __str__(self):
+        import getpass
+        return self.template.replace("$USER", getpass.getuser())
+
+# Defaults of "--workdir" and "--ollama-models". Only resolved when the option is not given (or help is shown).
+WORKDIR_DEFAULT = UserPath("/home/$USER/.ollama/ondemand")
+OLLAMA_MODELS_DEFAULT = UserPath("/home/$USER/.ollama/models")
+
+@cache
 def get_args():
+    """
+    Parse command-line arguments. Parsed only once per process; later calls return the same namespace.
+    
+    Input:
+        None
+    Output: 
+        args:   Arguments namespace
+    """
+    
+    import argparse
+    import os
+    import sys
+    
+    # Skip argument parsing entirely for programmatic launches (job scripts, services, etc.)
+    if (os.environ.get("OLLAMAONDEMAND_SKIP_ARGS")):
+        return get_args_from_env()
+    
+    # Disable colorized help on Python 3.14+, which otherwise re-scans environment variables on every add_argument()
+    kwargs = {"color": False} if sys.version_info >= (3, 14) else {}
     
     parser = argparse.ArgumentParser(
         description="Ollama OnDemand launcher", 
-        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+        **kwargs
     )
 
     #------------------------------------------------------------------
@@ -54,7 +88,7 @@ def get_args():
     )
     
     group_server.add_argument(
-        "--workdir", "-w", type=str, default="/home/"+getpass.getuser()+"/.ollama/ondemand",
+        "--workdir", "-w", type=str, default=WORKDIR_DEFAULT,
         help="Ollama Ondemand work directory for data storage."
     )
 
@@ -72,7 +106,7 @@ def get_args():
     )
     
     group_ollama.add_argument(
-        "--ollama-models", type=str, default="/home/"+getpass.getuser()+"/.ollama/models",
+        "--ollama-models", type=str, default=OLLAMA_MODELS_DEFAULT,
         help="Path to Ollama models."
     )
 
@@ -81,10 +115,66 @@ def get_args():
         help="A smaller model used for fast auto-generating chat titles."
     )
 
+    group_ollama.add_argument(
+        "--max-history-messages", type=int, default=0,
+        help="Maximum number of latest chat messages sent to the model with each message (0 for no limit). Stored chat history is not trimmed."
+    )
+
     group_ollama.add_argument(
         "--model-filter", type=str, default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "remotemodels_filter.json"),
         help="Path to the JSON file defining the remote model filter."
     )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+    
+    # Resolve default work directory and model path lazily (user name is looked up only if needed)
+    for name in ("workdir", "ollama_models"):
+        if (isinstance(getattr(args, name), UserPath)):
+            setattr(args, name, str(getattr(args, name)))
+
+    return args
+
 
+def get_args_from_env():
+    """
+    Build arguments from "OLLAMAONDEMAND_*" environment variables instead of command line.
+    Enabled by setting "OLLAMAONDEMAND_SKIP_ARGS" (non-empty). Unset variables fall back to command-line defaults.
+    "OLLAMAONDEMAND_DEBUG" enables debug mode when set to "1", "true", "yes" or "on".
+    
+    Input:
+        None
+    Output: 
+        args:   Arguments namespace (same attributes as get_args())
+    """
+    
+    import argparse
+    import os
+    
+    env = os.environ
+    parser = argparse.ArgumentParser(usage=argparse.SUPPRESS, add_help=False)
+    
+    def env_int(name, default):
+        # Report invalid values like argparse does for "--port", etc. (usage error, exit status 2)
+        value = env.get(name, default)
+        try:
+            return int(value)
+        except ValueError:
+            parser.error(f"environment variable {name}: invalid int value: {value!r}")
+    
+    def env_path(name, default):
+        # Resolve default path lazily (user name is looked up only if needed), as get_args() does
+        return env.get(name) or str(default)
+    
+    return argparse.Namespace(
+        debug           = env.get("OLLAMAONDEMAND_DEBUG", "").strip().lower() in ("1", "true", "yes", "on"),
+        host            = env.get("OLLAMAONDEMAND_HOST", "0.0.0.0"),
+        port            = env_int("OLLAMAONDEMAND_PORT", "7860"),
+        root_path       = env.get("OLLAMAONDEMAND_ROOT_PATH"),
+        workdir         = env_path("OLLAMAONDEMAND_WORKDIR", WORKDIR_DEFAULT),
+        ollama_host     = env.get("OLLAMAONDEMAND_OLLAMA_HOST", "127.0.0.1:11434"),
+        ollama_models   = env_path("OLLAMAONDEMAND_OLLAMA_MODELS", OLLAMA_MODELS_DEFAULT),
+        title_model     = env.get("OLLAMAONDEMAND_TITLE_MODEL", "gemma3:4b"),
+        max_history_messages = env_int("OLLAMAONDEMAND_MAX_HISTORY_MESSAGES", "0"),
+        model_filter    = env.get("OLLAMAONDEMAND_MODEL_FILTER") or \
+                              os.path.join(os.path.dirname(os.path.abspath(__file__)), "remotemodels_filter.json")
+    )
@@ -1,26 +1,130 @@
 # Chat sessions management
+#   * On disk, each chat is stored in its own file, so saving only rewrites the chats that changed:
+#       [workdir]/chats/index.json      - List of chats (id and title), newest first
+#       [workdir]/chats/[id].json       - Chat history of each chat (compact JSON, no indentation)
+#       [workdir]/chats_archive/[YYYY-MM]/[id].json
+#                                       - Chat history of deleted chats (moved, by month of deletion)
 
 import os
+import sys
 import json
+import uuid
+import time
+import threading
+import orjson
+from collections import OrderedDict
 
-chats = [
-    {
-        "title": "New Chat",
-        "history": []
-    }
-]
+# Chat storage directory and index file (relative to work directory)
+CHATS_DIR = "chats"
+INDEX_FILE = "index.json"
+ARCHIVE_DIR = "chats_archive"
 
-def load_chat(index):
+def create_chat():
     """
-    Load chat at given index.
+    Create a new (empty) chat session entry.
     
     Input:
-        index:          Chat index
+        None
+    Output: 
+        chat:           Chat session dictionary
+    """
+    return { "id": uuid.uuid4().hex, "title": "New Chat", "history": [] }
+
+# Chat sessions by ID, newest first
+#   (OrderedDict for O(1) insertion of new chats at the front, and O(1) lookup / deletion by ID)
+chats = OrderedDict((chat["id"], chat) for chat in [create_chat()])
+
+# Pending changes to be written by the next save_chats()
+dirty = set(chats)                              # IDs of chats whose history changed
+deleted = set()                                 # IDs of chats deleted
+writing = set()                                 # IDs of chats taken by save_chats() whose file is not written yet
+lock = threading.Lock()                         # Guards "dirty", "deleted" and "writing" (saving runs in background threads)
+
+# Directory of loaded chats (chat history is read from here on first access, and after unload_chat())
+chats_dir_loaded = None
+
+# Cached chat titles (rebuilt by get_chat_titles() after any change to chat list or titles, except new chats)
+titles_cache = None
+titles_numbered = False                         # Whether cached titles include numbered "New Chat N" (shift with position)
+
+# Hash of the last index written by save_chats() (to skip writing an unchanged index)
+index_hash = None
+
+def load_chat(chat_id):
+    """
+    Load chat with given ID.
+    
+    Input:
+        chat_id:        Chat ID
     Output: 
         chat_history:   List of chat (Gradio chatbox compatible)
     """
-    return chats[index]["history"]
     
+    chat = chats[chat_id]
+    
+    # Chat history is loaded lazily, on first access
+    if "history" not in chat:
+        chat.setdefault("history", read_history(chat["id"]))
+    
+    return chat["history"]
+
+def read_chat(chat_id):
+    """
+    Read chat with given ID, without keeping its history in memory if not loaded yet.
+    
+    Input:
+        chat_id:        Chat ID
+    Output: 
+        chat_history:   List of chat (Gradio chatbox compatible)
+    """
+    
+    history = chats[chat_id].get("history")
+    
+    return history if history is not None else read_history(chat_id)
+
+def unload_chat(chat_id):
+    """
+    Release chat history with given ID from memory (read again from file on next access).
+    Chats with unsaved changes, or being written, are kept (the file would be stale).
+    
+    Input:
+        chat_id:        Chat ID
+    Output: 
+        unloaded:       Whether chat history was released
+    """
+    with lock:
+        chat = chats.get(chat_id)
+        if (chat is None or chat_id in dirty or chat_id in writing or chats_dir_loaded is None):
+            return False
+        return chat.pop("history", None) is not None
+    
+def unload_chats(keep=None):
+    """
+    Release chat history of all chats but the given one from memory (see unload_chat()).
+    Chats kept earlier for unsaved changes are released once saved.
+    
+    Input:
+        keep:           Chat ID to keep (None to release all)
+    Output: 
+        None
+    """
+    
+    for chat_id in list(chats):
+        if (chat_id != keep):
+            unload_chat(chat_id)
+    
+def touch_chat(chat_id):
+    """
+    Mark chat history with given ID as modified, so it is written on next save.
+    
+    Input:
+        chat_id:        Chat ID
+    Output: 
+        None
+    """
+    with lock:
+        dirty.add(chat_id)
+
 def new_chat():
     """
     New chat.
@@ -28,60 +132,80 @@ def new_chat():
     Input:
         None
     Output: 
-        chat_history:   List of chat (Gradio chatbox compatible)
+        chat_id:        ID of the new chat
     """
-    chats.insert(0, { "title": "New Chat", "history": [] })
-    return chats[0]["history"]
+    global titles_cache
+    chat = create_chat()
+    chats[chat["id"]] = chat
+    chats.move_to_end(chat["id"], last=False)
+    
+    # Prepend to cached titles instead of rebuilding them (new list, as cached lists are compared by identity)
+    if (titles_cache is not None and not titles_numbered):
+        titles_cache = [ (chat["id"], chat["title"]) ] + titles_cache
+    else:
+        titles_cache = None
+    with lock:
+        dirty.add(chat["id"])
+    return chat["id"]
 
-def delete_chat(index):
+def delete_chat(chat_id):
     """
-    Delete chat session at the specified index.
+    Delete chat session with the specified ID.
     
     Input:
-        index: Index of chat session to delete
+        chat_id: ID of chat session to delete
     Output:
         None
     """
-    if 0 <= index < len(chats):
-        del chats[index]
+    global titles_cache
+    if chats.pop(chat_id, None) is not None:
+        with lock:
+            deleted.add(chat_id)
+        titles_cache = None
 
-def set_chat_title(index, title):
+def set_chat_title(chat_id, title):
     """
-    Set chat session title at index.
+    Set chat session title with given ID.
     
     Input:
-        index:  Index of chat session
-        title:  New title
+        chat_id:    ID of chat session
+        title:      New title
     Output: 
         None
     """
-    chats[index]["title"] = title
+    global titles_cache
+    chats[chat_id]["title"] = title
+    titles_cache = None
 
-def get_chat_title(index):
+def get_chat_title(chat_id):
     """
-    Get chat session title at index.
+    Get chat session title with given ID.
     
     Input:
-        index:  Index of chat session
+        chat_id:    ID of chat session
     Output: 
-        title:  Chat title
+        title:      Chat title
     """
-    return(chats[index]["title"])
+    return(chats[chat_id]["title"])
 
 def get_chat_titles():
     """
-    Get list of chat titles.
+    Get list of chat titles, newest first.
     
     Input:
         None
     Output: 
-        chat_titles: List of chat titles
+        chat_titles: List of (chat ID, chat title) tuples (cached, do not modify)
     """
-    return [ chat["title"] if chat["title"] else f"New Chat {i+1}" for i, chat in enumerate(chats) ]
+    global titles_cache, titles_numbered
+    if titles_cache is None:
+        titles_cache = [ (chat["id"], chat["title"] if chat["title"] else f"New Chat {i+1}") for i, chat in enumerate(chats.values()) ]
+        titles_numbered = not all(chat["title"] for chat in chats.values())
+    return titles_cache
 
 def save_chats(workdir):
     """
-    Save chat history in work directory.
+    Save chat history in work directory. Only chats modified since last save are written.
     
     Input:
         workdir:    Work directory
@@ -89,36 +213,163 @@ def save_chats(workdir):
         None
     """
 
+    global dirty, deleted, index_hash
+
+    # Take pending changes, and snapshot chat list (may be modified by other threads while saving)
+    #   (Histories to write are taken under lock too, and marked as being written until their file is written,
+    #    so unload_chat() never drops a history whose file is not up to date yet)
+    with lock:
+        (ids_dirty, ids_deleted) = (dirty, deleted)
+        (dirty, deleted) = (set(), set())
+        snapshot = list(chats.values())
+        histories = [ (chat["id"], chat["history"]) for chat in snapshot if chat["id"] in ids_dirty and "history" in chat ]
+        writing.update(chat_id for (chat_id, _) in histories)
+
     try:
-        
-        # Create work directory if it does not exist
-        os.makedirs(workdir, exist_ok=True)
 
-        # Dump chats if it is accessible.
-        file_path = os.path.join(workdir, "chats.json")
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(chats, f, indent=2, ensure_ascii=False)
-            
+        # Create chat directory if it does not exist
+        chats_dir = os.path.join(workdir, CHATS_DIR)
+        os.makedirs(chats_dir, exist_ok=True)
+
+        # Dump modified chats (skip chats never loaded, which are unchanged)
+        for (chat_id, history) in histories:
+            write_file(os.path.join(chats_dir, chat_id + ".json"), history, indent=False)
+            with lock:
+                writing.discard(chat_id)
+
+        # Dump index (skip if unchanged since last save)
+        index = orjson.dumps([ { "id": chat["id"], "title": chat["title"] } for chat in snapshot ], option=orjson.OPT_INDENT_2)
+        if hash(index) != index_hash:
+            write_file(os.path.join(chats_dir, INDEX_FILE), index)
+            index_hash = hash(index)
+
+        # Archive deleted chats (a rename, so deleting never rewrites chat history)
+        if ids_deleted:
+            archive_dir = os.path.join(workdir, ARCHIVE_DIR, time.strftime("%Y-%m"))
+            os.makedirs(archive_dir, exist_ok=True)
+            for chat_id in ids_deleted:
+                try:
+                    os.replace(os.path.join(chats_dir, chat_id + ".json"), os.path.join(archive_dir, chat_id + ".json"))
+                except FileNotFoundError:
+                    pass
+
     except Exception:
-        pass
+
+        # Keep pending changes for next save (still dirty, so no longer marked as being written)
+        with lock:
+            dirty |= ids_dirty
+            deleted |= ids_deleted
+            writing.difference_update(chat_id for (chat_id, _) in histories)
 
 def load_chats(workdir):
     """
-    Load chat history in work directory.
+    Load chat list in work directory.
+    
+    Input:
+        workdir:    Work directory
+    Output: 
+        None
+    """
+    global chats, chats_dir_loaded, titles_cache, index_hash
+
+    # Chat histories are read from (and saved to) this directory
+    chats_dir = os.path.join(workdir, CHATS_DIR)
+    chats_dir_loaded = chats_dir
+
+    # Migrate from single-file storage ([workdir]/chats.json) if per-chat files do not exist yet
+    if not os.path.exists(os.path.join(chats_dir, INDEX_FILE)):
+        migrate_chats(workdir)
+        return
+
+    try:
+
+        # Load chat list only. Chat histories are loaded on first access (see load_chat()).
+        with open(os.path.join(chats_dir, INDEX_FILE), "rb") as f:
+            index = f.read()
+            chats = OrderedDict((entry["id"], entry) for entry in orjson.loads(index))
+        index_hash = hash(index)
+        titles_cache = None
+
+        # Always keep at least one chat
+        if not chats:
+            new_chat()
+
+    except Exception:
+        pass
+
+def read_history(chat_id):
+    """
+    Read chat history of a chat from file.
+    
+    Input:
+        chat_id:        Chat ID
+    Output: 
+        chat_history:   List of chat (empty if not found)
+    """
+    
+    try:
+        with open(os.path.join(chats_dir_loaded, chat_id + ".json"), "rb") as f:
+            return intern_roles(orjson.loads(f.read()))
+    except Exception:
+        return []
+
+def intern_roles(history):
+    """
+    Intern role strings ("user", "assistant", ...) of chat messages, so all messages share one string per role
+    instead of a fresh copy per message. (Dictionary keys are already shared by orjson's key cache.)
+    
+    Input:
+        history:        List of chat messages
+    Output: 
+        history:        Same list, with role strings interned
+    """
+    for message in history:
+        if isinstance(message.get("role"), str):
+            message["role"] = sys.intern(message["role"])
+    return history
+
+def migrate_chats(workdir):
+    """
+    Migrate chat history from single-file storage ([workdir]/chats.json) to per-chat files.
+    The old file is kept as is.
     
     Input:
         workdir:    Work directory
     Output: 
         None
     """
-    global chats
+    global chats, titles_cache
 
     try:
 
         # Load chats if exists
         file_path = os.path.join(workdir, "chats.json")
         with open(file_path, "r", encoding="utf-8") as f:
-            chats = json.load(f)
-            
+            chats = OrderedDict((chat["id"], chat) for chat in ({ "id": uuid.uuid4().hex, **chat } for chat in json.load(f)))
+        titles_cache = None
+
     except Exception:
-        pass
\ No newline at end of file
+        return
+
+    # Save in per-chat files
+    with lock:
+        dirty.update(chats)
+    save_chats(workdir)
+
+def write_file(file_path, data, indent=True):
+    """
+    Write data as JSON to file. Write to a temporary file first, then atomically replace, so a crash never leaves a torn file.
+    
+    Input:
+        file_path:  File path
+        data:       Data to write (bytes are written as is)
+        indent:     Whether to indent JSON (Default: True)
+    Output: 
+        None
+    """
+    if not isinstance(data, bytes):
+        data = orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None)
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, file_path)
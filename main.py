@@ -6,13 +6,22 @@
 import os
 import requests
 import json
+import orjson
+import copy
 import subprocess
 import time
 import html
 import re
 import shutil
 import threading
+import asyncio
+import hashlib
+import itertools
+import bisect
 import ollama
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from functools import partial, cache
 from typing import Literal
 import chatsessions as cs
 import usersettings as us
@@ -27,6 +36,78 @@ args = get_args()
 os.environ["GRADIO_TEMP_DIR"] = args.workdir + "/cache"
 import gradio as gr
 
+# Reasoning block in generated text ("<think>...</think>")
+THINK_PATTERN = re.compile(r"<think>.*?</think>", re.DOTALL)
+
+# User input updates while streaming / idle
+#   (Yield a copy: Gradio pops "value" from update dictionaries, so the templates themselves must not be yielded)
+UPDATE_INPUT_STREAMING = gr.update(value="", submit_btn=False, stop_btn=True)
+UPDATE_INPUT_IDLE = gr.update(value="", submit_btn=True, stop_btn=False)
+
+@cache
+def read_css(file_path):
+    """
+    Read CSS file once, with comments removed and whitespace collapsed (smaller page sent to browser).
+    
+    Input:
+        file_path:  CSS file path
+    Output: 
+        css:        CSS code
+    """
+    with open(file_path, "r", encoding="utf-8") as f:
+        css = f.read()
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    return re.sub(r"\s+", " ", css).strip()
+
+def new_assistant_message():
+    """
+    Create an empty assistant message, to be filled by streaming.
+    
+    Input:
+        None
+    Output: 
+        message:    Assistant message dictionary
+    """
+    return {"role": "assistant", "content": "", "thinking": ""}
+
+async def until_stopped(stream, stop_event):
+    """
+    Iterate an async stream until stop event is set. Waiting for the next chunk is interrupted as soon as the
+    event is set, instead of when the next chunk arrives.
+    
+    Input:
+        stream:     Async iterator (e.g. streamed Ollama response)
+        stop_event: Stop event (asyncio.Event)
+    Output: 
+        chunk:      Chunks of stream (yielded)
+    """
+    stop_wait = asyncio.ensure_future(stop_event.wait())
+    next_chunk = None
+    try:
+        while True:
+            next_chunk = asyncio.ensure_future(anext(stream))
+            await asyncio.wait((next_chunk, stop_wait), return_when=asyncio.FIRST_COMPLETED)
+            
+            # Stopped while waiting (pending read is cancelled below)
+            if (not next_chunk.done()):
+                return
+            
+            # End of stream
+            if (isinstance(next_chunk.exception(), StopAsyncIteration)):
+                return
+            
+            yield next_chunk.result()
+    finally:
+        stop_wait.cancel()
+        
+        # Cancel pending read (closes the connection), also when the consumer itself is cancelled,
+        # and wait until it is cancelled, so no read is left running on the stream
+        if (next_chunk is not None and not next_chunk.done()):
+            next_chunk.cancel()
+            await asyncio.wait((next_chunk,))
+        if (next_chunk is not None and not next_chunk.cancelled()):
+            next_chunk.exception()
+
 #======================================================================
 # Misc utilities
 #======================================================================
@@ -38,7 +119,7 @@ class MiscUtils:
         """
         Clean up orphaned files in the cache directory.
         Each uploaded file is stored in a uniquely-hashed subfolder by Gradio.
-        This method reads the chat history file as plain text and checks whether
+        This method reads the chat history files as plain text and checks whether
         each subfolder name is referenced. If not, the entire subfolder is deleted.
         
         Input:
@@ -53,11 +134,19 @@ class MiscUtils:
         if not os.path.isdir(cache_dir):
             return
         
-        # Read chat history file as plain text
-        chat_file = os.path.join(self.args.workdir, "chats.json")
+        # Read chat history files as plain text
+        #   (Archived chats are included, so attachments of deleted chats are kept with their archived history)
+        chats_dir = os.path.join(self.args.workdir, cs.CHATS_DIR)
+        archive_dir = os.path.join(self.args.workdir, cs.ARCHIVE_DIR)
         try:
-            with open(chat_file, "r", encoding="utf-8") as f:
-                chat_text = f.read()
+            chat_texts = []
+            file_paths = [os.path.join(chats_dir, file_name) for file_name in os.listdir(chats_dir)]
+            for (dir_path, _, file_names) in os.walk(archive_dir):
+                file_paths += [os.path.join(dir_path, file_name) for file_name in file_names]
+            for file_path in file_paths:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    chat_texts.append(f.read())
+            chat_text = "".join(chat_texts)
         except Exception:
             return
         
@@ -81,23 +170,61 @@ class MiscUtils:
         if deleted_count > 0:
             print(f"Cache cleanup: removed {deleted_count} orphaned folder(s).")
 
-    def list_installed_models(self, formatted=False):
+    def list_installed_models(self, formatted=False, max_age=None):
         """
         List all installed models.
         
         Input:
             formatter:  Whether to return a formatted list of tuples for model selector dropdown (Default: False)
+            max_age:    Maximum age (seconds) of cached list before querying server again (Default: None, no limit)
         Output: 
             models:     List of all model names
         """
+        
+        # Query Ollama server only once until invalidated (see invalidate_models_cache()) or expired
+        if self.models_cache is None or \
+           (max_age is not None and time.monotonic() - self.models_cache_time > max_age):
+            self.models_cache = self.client.list().models
+            self.models_cache_time = time.monotonic()
+        
         if formatted:
             models = sorted([(f"{model.model} ({naturalsize(model.size, binary=True, gnu=True, format='%.0f')})", model.model) \
-                        for model in self.client.list().models])
+                        for model in self.models_cache])
         else:
-            models = sorted([model.model for model in self.client.list().models])
+            models = sorted([model.model for model in self.models_cache])
         
         return models if models else ["(No model is installed...)"]
 
+    def refresh_model_selector(self):
+        """
+        Refresh model selector on page load (picks up models installed / removed outside this app, e.g., by Ollama CLI).
+        
+        Input:
+            None
+        Output: 
+            gr.update:  Update to model selector
+        """
+        
+        self.models = self.list_installed_models(max_age=self.models_cache_max_age)
+        
+        # Fall back to first model if the selected one was removed
+        if (not self.settings.get("model_selected") in self.models):
+            self.settings["model_selected"] = self.models[0]
+            self.save_settings()
+        
+        return gr.update(choices=self.list_installed_models(formatted=True), value=self.settings["model_selected"])
+
+    def invalidate_models_cache(self):
+        """
+        Invalidate cached list of installed models. Call after models are installed / removed, or server is restarted.
+        
+        Input:
+            None
+        Output: 
+            None
+        """
+        self.models_cache = None
+
     def dict_installed_models(self):
         """
         List all installed models in dictionary form.
@@ -166,46 +293,51 @@ class MiscUtils:
         
         blobs_path = os.path.join(model_path, "blobs")
         manifests_path = os.path.join(model_path, "manifests")
-        return(os.access(model_path, os.R_OK) \
+        if not (os.access(model_path, os.R_OK) \
                 and os.access(blobs_path, os.R_OK) \
-                and os.access(manifests_path, os.R_OK) \
-                and len(os.listdir(manifests_path)) > 0)
+                and os.access(manifests_path, os.R_OK)):
+            return False
+        
+        # Non-empty "manifests" (stop at the first entry instead of listing the whole directory)
+        with os.scandir(manifests_path) as entries:
+            return next(entries, None) is not None
 
-    def update_current_chat(self, chat_index):
+    def update_current_chat(self, chat_id):
         """
-        Update current chat index, history to given index.
+        Update current chat ID, history to given chat.
         
         Input:
-            chat_index:     Chat index (-1 to start a new chat, others to select existings).
+            chat_id:        Chat ID (None to start a new chat, others to select existings).
         Output: 
             None
         """
         
-        if chat_index == -1:
+        # Create a new chat if requested
+        if chat_id is None:
+            chat_id = cs.new_chat()
         
-            # Update chat index
-            self.chat_index = 0
-            
-            # Create a new chat and update chat history
-            self.chat_history = cs.new_chat()
-            
-            # Get chat title
-            self.chat_title = cs.get_chat_title(0)
-            
-        else:
+        # Update chat ID
+        self.chat_id = chat_id
         
-            # Update chat index
-            self.chat_index = chat_index
-            
-            # Update chat history
-            self.chat_history = cs.load_chat(chat_index)
-            
-            # Get chat title
-            self.chat_title = cs.get_chat_title(chat_index)
+        # Update chat history
+        self.chat_history = cs.load_chat(chat_id)
+        
+        # Reset caches of current chat (filled again on demand, so switching back to a chat costs O(turns) once)
+        #   self.chat_rows:     Chatbot row cache (see history_index())
+        #   self.chat_stream:   Formatted messages cache (see chat_history_stream())
+        #   self.chat_display:  Displayed messages cache (see chat_history_display_prefix())
+        (self.chat_rows, self.chat_stream, self.chat_display) = ([], [], [])
+        
+        # Release history of other chats (kept while unsaved), so only the current chat stays in memory
+        cs.unload_chats(keep=chat_id)
+        
+        # Get chat title
+        self.chat_title = cs.get_chat_title(chat_id)
 
     def chat_history_stream(self):
         """
         Format chat_history list into an Ollama processable format, particularly for multimodal attachments.
+        Formatted messages of current chat are cached, so attachments are only processed once, not on every message.
         
         Input:
             None
@@ -213,88 +345,180 @@ class MiscUtils:
             chat_history:   Formatted chat history
         """
         
-        # Make a copy of the chat history
-        chat_history = []
-        
-        # Loop and replace
-        for chat in self.chat_history:
+        # Format messages appended since last call
+        #   self.chat_stream[i] is the list of formatted messages of chat history message i
+        for chat in self.chat_history[len(self.chat_stream):]:
             
             # Format user message
             if (chat["role"] == "user"):
             
-                chat_history += mm.format_chat_stream(chat)
+                self.chat_stream.append(mm.format_chat_stream(chat))
             
             else:
                 
-                chat_history.append(chat)
+                self.chat_stream.append([chat])
         
-        return(chat_history)
+        # Only send the latest messages if limited
+        window = self.chat_stream[self.history_window_start():]
+        
+        # Flatten
+        return([chat for formatted in window for chat in formatted])
 
-    def chat_history_display(self):
+    def history_window_start(self):
         """
-        Format chat_history list into a more clean HTML for display.
+        Index of the first chat history message sent to models, if limited by "--max-history-messages".
+        The window starts at a user message, never at an orphaned reply.
         
         Input:
             None
+        Output: 
+            start:          Index of first message in chat history
+        """
+        
+        limit = self.args.max_history_messages
+        count = len(self.chat_history)
+        if (limit <= 0 or count <= limit):
+            return 0
+        
+        start = count - limit
+        while (start < count - 1 and self.chat_history[start]["role"] != "user"):
+            start += 1
+        
+        return start
+
+    def chat_history_display(self, messages=None):
+        """
+        Format chat_history list into a more clean HTML for display.
+        
+        Input:
+            messages:       Chat messages to format (Default: current chat history)
         Output: 
             chat_history:   Formatted chat history
         """
         
+        # Current chat history: previous messages are cached, only the last message is formatted
+        if (messages is None):
+            return self.chat_history_display_prefix() + \
+                   (self.chat_message_display(self.chat_history[-1]) if self.chat_history else [])
+        
         # Make a copy of the chat history
         chat_history = []
         
         # Loop and replace
-        for chat in self.chat_history:
-            
-            # Make a copy
-            chat_tmp = chat.copy()
-            
-            # Format assistant message 
-            if (chat_tmp["role"] == "assistant"):
-            
-                # If "thinking" exists, add thinking process depending on the process
-                if (chat_tmp.get("thinking")):
-                    
-                    chat_tmp["content"] = self.think_tags["head"] + \
-                                          chat_tmp["thinking"] + \
-                                          self.think_tags["tail"] + \
-                                          chat_tmp["content"]
-            
-            # Format user message
-            elif (chat_tmp["role"] == "user"):
-            
-                # Display user uploaded images
-                if (chat_tmp.get("images")):
-            
-                    # Append single image or gallery, depending on the number of images
-                    if (len(chat_tmp["images"]) <= 1):
-                        chat_history.append({ "role": "user", "content": gr.Image(chat_tmp["images"][0]) })
-                    elif (len(chat_tmp["images"]) >= 6):
-                        chat_history.append({ "role": "user", "content": gr.Gallery(chat_tmp["images"], columns=3) })
-                    else:
-                        chat_history.append({ "role": "user", "content": gr.Gallery(chat_tmp["images"], columns=2) })
-            
-                # Display user uploaded files (contains at least one non-image)
-                elif (chat_tmp.get("files")):
-            
-                    # Append each file as a separated message
-                    for file in chat_tmp["files"]:
-                        chat_history.append({ "role": "user", "content": gr.File(file) })
-                
-            # Append message
-            chat_history.append(chat_tmp)
+        for chat in messages:
+            chat_history += self.chat_message_display(chat)
                                         
         return(chat_history)
 
+    def chat_history_display_prefix(self):
+        """
+        Format all but the last message of chat_history for display. Formatted messages of current chat are cached
+        (the last message is not cached, as it may still be streaming).
+        
+        Input:
+            None
+        Output: 
+            chat_history:   Formatted chat history, without the last message
+        """
+        
+        # Format messages appended since last call
+        #   self.chat_display[i] is the list of displayed messages of chat history message i
+        for chat in self.chat_history[len(self.chat_display):-1]:
+            self.chat_display.append(self.chat_message_display(chat))
+        
+        # Flatten
+        return([chat for formatted in self.chat_display for chat in formatted])
+
+    def chat_message_display(self, chat):
+        """
+        Format a single chat message for display.
+        
+        Input:
+            chat:           Chat message
+        Output: 
+            [chat,...]:     Formatted chat messages (user uploaded attachments are displayed as separated messages)
+        """
+        
+        chat_history = []
+        
+        # Make a copy
+        chat_tmp = chat.copy()
+        
+        # Format assistant message 
+        if (chat_tmp["role"] == "assistant"):
+        
+            # If "thinking" exists, add thinking process depending on the process
+            if (chat_tmp.get("thinking")):
+                
+                chat_tmp["content"] = self.think_tags["head"] + \
+                                      chat_tmp["thinking"] + \
+                                      self.think_tags["tail"] + \
+                                      chat_tmp["content"]
+        
+        # Format user message
+        elif (chat_tmp["role"] == "user"):
+        
+            # Display user uploaded images
+            if (chat_tmp.get("images")):
+        
+                # Append single image or gallery, depending on the number of images
+                if (len(chat_tmp["images"]) <= 1):
+                    chat_history.append({ "role": "user", "content": gr.Image(chat_tmp["images"][0]) })
+                elif (len(chat_tmp["images"]) >= 6):
+                    chat_history.append({ "role": "user", "content": gr.Gallery(chat_tmp["images"], columns=3) })
+                else:
+                    chat_history.append({ "role": "user", "content": gr.Gallery(chat_tmp["images"], columns=2) })
+        
+            # Display user uploaded files (contains at least one non-image)
+            elif (chat_tmp.get("files")):
+        
+                # Append each file as a separated message
+                for file in chat_tmp["files"]:
+                    chat_history.append({ "role": "user", "content": gr.File(file) })
+            
+        # Append message
+        chat_history.append(chat_tmp)
+        
+        return(chat_history)
+
     def save_chat_history(self):
         """
         Save chats to file in user's work directory.
+        Saves run in a single background worker (so writes never overlap and never block the UI),
+        and are debounced: all calls within a short window are coalesced into a single write.
+        Only queues the write, so handlers call it directly instead of chaining it as another event.
         
         Input:
             None
         Output: 
             None
         """
+        
+        with self.save_lock:
+            
+            # Queue a write only if none is pending
+            if not self.save_pending:
+                self.save_pending = True
+                self.save_executor.submit(self.save_chat_history_now)
+
+    def save_chat_history_now(self):
+        """
+        Save chats to file in user's work directory (invoked by debounced save, in the save worker).
+        
+        Input:
+            None
+        Output: 
+            None
+        """
+        
+        # Wait for coalescing window
+        time.sleep(self.save_delay)
+        
+        # Clear pending write, so calls from now on queue a new one
+        with self.save_lock:
+            self.save_pending = False
+        
+        # Write
         cs.save_chats(self.args.workdir)
 
     def load_chat_history(self):
@@ -311,13 +535,47 @@ class MiscUtils:
     def save_settings(self):
         """
         Save user settings to file in user's work directory.
+        Like chat history, saves are debounced in the save worker (e.g., dragging a slider writes once).
         
         Input:
             None
         Output: 
             None
         """
-        us.save_settings(self.args.workdir, self.settings)
+        
+        # Options for streaming are pre-processed again on next use
+        self.stream_options_cache = None
+        
+        with self.save_lock:
+            
+            # Snapshot settings now (settings may be modified while the write is pending)
+            self.settings_snapshot = copy.deepcopy(self.settings)
+            
+            # Queue a write only if none is pending
+            if not self.settings_save_pending:
+                self.settings_save_pending = True
+                self.save_executor.submit(self.save_settings_now)
+
+    def save_settings_now(self):
+        """
+        Save latest user settings snapshot to file (invoked by debounced save, in the save worker).
+        
+        Input:
+            None
+        Output: 
+            None
+        """
+        
+        # Wait for coalescing window
+        time.sleep(self.save_delay)
+        
+        # Take latest snapshot, so calls from now on queue a new write
+        with self.save_lock:
+            self.settings_save_pending = False
+            settings = self.settings_snapshot
+        
+        # Write
+        us.save_settings(self.args.workdir, settings)
 
     def load_settings(self):
         """
@@ -342,6 +600,22 @@ class BuildLeft:
     # Listeners
     #------------------------------------------------------------------
 
+    def title_cache_key(self):
+        """
+        Key of current chat in the generated title cache: Hash of title model and user messages.
+        
+        Input:
+            None
+        Output: 
+            key:            Cache key (hex digest)
+        """
+        
+        key = hashlib.blake2b(self.args.title_model.encode(), digest_size=16)
+        for msg in self.chat_history:
+            if msg.get("role") == "user":
+                key.update(b"\x1f" + str(msg.get("content", "")).encode())
+        return key.hexdigest()
+
     def update_chat_selector(self):
         """
         Update chat selector, mainly for auto-generating a new chat title.
@@ -355,60 +629,81 @@ class BuildLeft:
         # If current chat does not have a title, ask client to summarize and generate one.
         if self.chat_title == "New Chat":
             
-            # Attempt to auto-generate a title using TITLE_MODEL
-            try:
-                
-                response = self.client.chat(
-                    model = self.args.title_model,
-                    messages = self.chat_history + \
-                        [ { "role": "user", 
-                            "content": "Summarize this entire conversation with less than six words. Be objective and formal (Don't use first person expression). No punctuation."} ],
-                    stream = False
-                )
-                
-                # Set new title
-                #   Generating and removing <think>*</think> provides the best compatibility between reasoning model and non-reasoning model.
-                new_title = response.message.content
-                new_title = re.sub(r"<think>.*?</think>", "", new_title, flags=re.DOTALL).strip()
-                
-            except Exception:
-                
-                # Fall back: use the first 10 words of the first user message as the title
-                first_user_content = ""
-                for msg in self.chat_history:
-                    if msg.get("role") == "user":
-                        content = msg.get("content", "")
-                        if isinstance(content, list):
-                            # Multimodal: extract plain text parts
-                            content = " ".join(part.get("text", "") for part in content if isinstance(part, dict) and part.get("type") == "text")
-                        first_user_content = content
-                        break
-                
-                words = first_user_content.split()
-                new_title = (" ".join(words[:10]) if words else "New Chat") + "..."
+            # Titles generated before for the same model and user messages are reused (see title_cache_key())
+            title_cache = self.settings.setdefault("title_cache", {})
+            key = self.title_cache_key()
             
-            self.chat_title = new_title
-            cs.set_chat_title(self.chat_index, new_title)
+            # Reuse cached title if exists
+            if key in title_cache:
+            
+                new_title = title_cache[key]
+            
+            # Otherwise, attempt to auto-generate a title using TITLE_MODEL
+            else:
             
+                try:
+                    
+                    response = self.client.chat(
+                        model = self.args.title_model,
+                        messages = itertools.chain(                         # Chained, not copied (client builds its own list)
+                            itertools.islice(self.chat_history, self.history_window_start(), None),
+                            [ { "role": "user", 
+                                "content": "Summarize this entire conversation with less than six words. Be objective and formal (Don't use first person expression). No punctuation."} ]),
+                        stream = False
+                    )
+                    
+                    # Set new title
+                    #   Generating and removing <think>*</think> provides the best compatibility between reasoning model and non-reasoning model.
+                    new_title = response.message.content
+                    new_title = THINK_PATTERN.sub("", new_title).strip()
+                    
+                    # Cache generated title (keeping only the most recent ones)
+                    title_cache[key] = new_title
+                    while len(title_cache) > self.title_cache_size:
+                        del title_cache[next(iter(title_cache))]
+                    self.save_settings()
+                    
+                except Exception:
+                    
+                    # Fall back: use the first 10 words of the first user message as the title
+                    first_user_content = ""
+                    for msg in self.chat_history:
+                        if msg.get("role") == "user":
+                            content = msg.get("content", "")
+                            if isinstance(content, list):
+                                # Multimodal: extract plain text parts
+                                content = " ".join(part.get("text", "") for part in content if isinstance(part, dict) and part.get("type") == "text")
+                            first_user_content = content
+                            break
+                    
+                    words = first_user_content.split()
+                    new_title = (" ".join(words[:10]) if words else "New Chat") + "..."
+            
+            self.chat_title = new_title
+            cs.set_chat_title(self.chat_id, new_title)
+        
+        # Save chat history (and title)
+        self.save_chat_history()
+        
         return gr.update(value=self.generate_chat_selector())
 
-    def select_chat(self, index):
+    def select_chat(self, chat_id):
         """
         Change selected chat.
         
         Input:
-            index:          Chat index
+            chat_id:        Chat ID
         Output: 
             chat_history:   Chat history
         """
         
         # Update current chat
-        self.update_current_chat(index)
+        self.update_current_chat(chat_id)
         
         # Return chat history to chatbot
         return self.chat_history_display()
 
-    def new_chat(self):
+    async def new_chat(self):
         """
         New chat.
         
@@ -420,73 +715,86 @@ class BuildLeft:
         """
         
         # Update current chat
-        self.update_current_chat(-1)
+        self.update_current_chat(None)
+        self.save_chat_history()
         
         # Return updated chat selector and current chat
         return gr.update(value=self.generate_chat_selector()), self.chat_history
 
-    def rename_chat(self, index, title):
+    async def rename_chat(self, chat_id, title):
         """
         Rename chat.
         
         Input:
-            index:          Chat index
+            chat_id:        Chat ID
             title:          New chat title
         Output: 
             chat_selector:  Chat selector update
         """
         
         # Change chat title
-        cs.set_chat_title(index, title)
+        cs.set_chat_title(chat_id, title)
         
         # Change current chat title if the current chat is being renamed
-        if (self.chat_index == index):
+        if (self.chat_id == chat_id):
             self.chat_title = title
+        
+        # Save chat history (and title)
+        self.save_chat_history()
 
-    def export_chat(self, index):
+    def export_chat(self, chat_id):
         """
         Export selected chat as JSON string for browser download.
         
         Input:
-            index:          Chat index
+            chat_id:        Chat ID
         Output: 
             history:        Selected chat hisotry
         """
         
-        return json.dumps(cs.load_chat(index), indent=2, ensure_ascii=False)
+        # Read without loading, so exporting another chat does not keep its history in memory
+        #   (orjson is a required dependency, also used for chat storage, so no stdlib json fallback)
+        return orjson.dumps(cs.read_chat(chat_id), option=orjson.OPT_INDENT_2).decode()
 
-    def delete_chat(self, index):
+    def delete_chat(self, chat_id):
         """
         Delete the current chat and update UI.
         
         Input:
-            index:          Chat index
+            chat_id:        Chat ID
         Output:
             chat_selector:  Chat selector update
             chat_history:   Chat history
         """
         
+        # Position of the chat to delete
+        chat_ids = [entry[0] for entry in cs.get_chat_titles()]
+        position = chat_ids.index(chat_id) if chat_id in chat_ids else 0
+        
         # Delegate deletion to chatsessions
-        cs.delete_chat(index)
-        num_chats = len(cs.get_chat_titles())
+        cs.delete_chat(chat_id)
+        chat_ids = [entry[0] for entry in cs.get_chat_titles()]
         
         # If all has been deleted, create a new one
-        if num_chats == 0:
+        if len(chat_ids) == 0:
         
-            return self.new_chat()
+            self.update_current_chat(None)
         
-        # If deleted a previous chat, and current chat_index is not 0, move up
-        elif self.chat_index >= index and self.chat_index > 0:
+        # If deleted current chat, move to the previous (newer) chat, or the first chat if it was the first
+        elif self.chat_id == chat_id:
         
-            self.chat_index -= 1
-            self.update_current_chat(self.chat_index)
-            return gr.update(value=self.generate_chat_selector()), self.chat_history_display()
+            self.update_current_chat(chat_ids[max(position-1, 0)])
             
-        # Otherwise, keep current chat index and reload
+        # Otherwise, keep current chat and reload
         else:
         
-            self.update_current_chat(self.chat_index)
-            return gr.update(value=self.generate_chat_selector()), self.chat_history_display()
+            self.update_current_chat(self.chat_id)
+        
+        # Save chat history
+        self.save_chat_history()
+        
+        # Return updated chat selector and current chat
+        return gr.update(value=self.generate_chat_selector()), self.chat_history_display()
 
     #------------------------------------------------------------------
     # Build UI
@@ -503,25 +811,32 @@ class BuildLeft:
         """
         
         titles = cs.get_chat_titles()
+        
+        # Reuse last result if nothing changed
+        #   (Chat titles list is rebuilt by chatsessions on any change, so an identity check is enough)
+        key = (self.chat_id, interactive)
+        if (self.chat_selector_cache and self.chat_selector_cache[0] is titles and self.chat_selector_cache[1] == key):
+            return self.chat_selector_cache[2]
+        
         html_chat_selector = ""
         
         if interactive:
         
-            for i, title in enumerate(titles):
-                active = "active-chat" if i == self.chat_index else ""
+            for chat_id, title in titles:
+                active = "active-chat" if chat_id == self.chat_id else ""
                 title = html.escape(title)
                 html_chat_selector += f"""
-                <div class='chat-entry {active}' onclick="select_chat_js({i})" id='chat-entry-{i}'>
-                    <span class='chat-title' id='chat-title-{i}' title='{title}'>{title}</span>
-                    <input class='chat-title-input custom-hidden' id='chat-title-input-{i}' autocomplete='off'
-                           onkeydown="rename_chat_confirm_js(event, {i})"
-                           onblur="rename_chat_cancel_js({i})" 
+                <div class='chat-entry {active}' onclick="select_chat_js('{chat_id}')" id='chat-entry-{chat_id}'>
+                    <span class='chat-title' id='chat-title-{chat_id}' title='{title}'>{title}</span>
+                    <input class='chat-title-input custom-hidden' id='chat-title-input-{chat_id}' autocomplete='off'
+                           onkeydown="rename_chat_confirm_js(event, '{chat_id}')"
+                           onblur="rename_chat_cancel_js('{chat_id}')" 
                             onclick="event.stopPropagation()" />
-                    <button class='menu-btn' onclick="event.stopPropagation(); open_menu({i})">⋯</button>
-                    <div class='chat-menu' id='chat-menu-{i}'>
-                        <button onclick="event.stopPropagation(); rename_chat_js({i})">Rename</button>
-                        <button onclick="event.stopPropagation(); export_chat_js({i})">Export</button>
-                        <button onclick="event.stopPropagation(); delete_chat_js({i})">Delete</button>
+                    <button class='menu-btn' onclick="event.stopPropagation(); open_menu('{chat_id}')">⋯</button>
+                    <div class='chat-menu' id='chat-menu-{chat_id}'>
+                        <button onclick="event.stopPropagation(); rename_chat_js('{chat_id}')">Rename</button>
+                        <button onclick="event.stopPropagation(); export_chat_js('{chat_id}')">Export</button>
+                        <button onclick="event.stopPropagation(); delete_chat_js('{chat_id}')">Delete</button>
                     </div>
                 </div>
 
@@ -529,13 +844,13 @@ class BuildLeft:
                 
         else:
         
-            for i, title in enumerate(titles):
+            for chat_id, title in titles:
                 title = html.escape(title)
                 html_chat_selector += f"""
                 <div class='chat-entry'>
                     <span class='chat-title' title='{title}'>{title}</span>
                     <button class='menu-btn'>⋯</button>
-                    <div class='chat-menu' id='chat-menu-{i}'>
+                    <div class='chat-menu' id='chat-menu-{chat_id}'>
                         <button>Rename</button>
                         <button>Export</button>
                         <button>Delete</button>
@@ -543,6 +858,7 @@ class BuildLeft:
                 </div>
                 """
         
+        self.chat_selector_cache = (titles, key, html_chat_selector)
         return html_chat_selector
 
     def build_left(self):
@@ -567,7 +883,7 @@ class BuildLeft:
             )
             
             # Hidden elements (For customized JS responses)
-            self.gr_leftbar.hidden_input_chatindex = gr.Number(elem_id="hidden_input_chatindex", elem_classes=["custom-hidden"])
+            self.gr_leftbar.hidden_input_chatid = gr.Textbox(elem_id="hidden_input_chatid", elem_classes=["custom-hidden"])
             self.gr_leftbar.hidden_input_rename = gr.Textbox(elem_id="hidden_input_rename", elem_classes=["custom-hidden"])
             self.gr_leftbar.hidden_input_export = gr.Textbox(elem_classes=["custom-hidden"])
             self.gr_leftbar.hidden_btn_select = gr.Button(elem_id="hidden_btn_select", elem_classes=["custom-hidden"])
@@ -590,16 +906,12 @@ class BuildLeft:
             fn=self.new_chat,
             inputs=[],
             outputs=[self.gr_leftbar.chat_selector, self.gr_main.chatbot]
-        ).then(
-            fn=self.save_chat_history,              # Save chat history
-            inputs=[],
-            outputs=[]
         )
         
         # Change selected chat
         self.gr_leftbar.hidden_btn_select.click(
             fn=self.select_chat,
-            inputs=[self.gr_leftbar.hidden_input_chatindex],
+            inputs=[self.gr_leftbar.hidden_input_chatid],
             outputs=[self.gr_main.chatbot]
         ).then(
             fn=None,
@@ -611,18 +923,14 @@ class BuildLeft:
         # Rename chat
         self.gr_leftbar.hidden_btn_rename.click(    # Do rename
             fn=self.rename_chat,
-            inputs=[self.gr_leftbar.hidden_input_chatindex, self.gr_leftbar.hidden_input_rename],
-            outputs=[]
-        ).then(
-            fn=self.save_chat_history,              # Save chat history
-            inputs=[],
+            inputs=[self.gr_leftbar.hidden_input_chatid, self.gr_leftbar.hidden_input_rename],
             outputs=[]
         )
 
         # Export chat
         self.gr_leftbar.hidden_btn_export.click(
             fn=self.export_chat,
-            inputs=[self.gr_leftbar.hidden_input_chatindex],
+            inputs=[self.gr_leftbar.hidden_input_chatid],
             outputs=[self.gr_leftbar.hidden_input_export]
         ).then(
             fn=None,
@@ -634,12 +942,8 @@ class BuildLeft:
         # Delete chat
         self.gr_leftbar.hidden_btn_delete.click(
             fn=self.delete_chat,                    # Do delete
-            inputs=[self.gr_leftbar.hidden_input_chatindex],
+            inputs=[self.gr_leftbar.hidden_input_chatid],
             outputs=[self.gr_leftbar.chat_selector, self.gr_main.chatbot]
-        ).then(
-            fn=self.save_chat_history,              # Save chat history
-            inputs=[],
-            outputs=[]
         )
 
 
@@ -667,34 +971,23 @@ class BuildRight:
         """
         
         # Save updated "options" dictionary
+        options = self.settings.get("options") or {}
         
-        # If "options" dictionary exists in settings
-        if (self.settings.get("options")):
+        # Skip if nothing changed (e.g., "use default" for a parameter never customized)
+        if ((is_default and name not in options) or (not is_default and name in options and options[name] == value)):
+            return(gr.update(visible=not is_default))
         
-            # If not using default, save customized value to "options" dictionary
-            if (not is_default):
-                
-                self.settings["options"][name] = value
-                
-            # If using default, remove the key from "options" dictionary
-            else:
+        # If not using default, save customized value to "options" dictionary
+        if (not is_default):
             
-                if (name in self.settings["options"]):
-                    del self.settings["options"][name]
-        
-        # Or if not
+            options[name] = value
+            
+        # If using default, remove the key from "options" dictionary
         else:
         
-            # If not using default, save customized value to "options" dictionary
-            if (not is_default):
-                
-                self.settings["options"] = {name: value}
-                
-            # If using default, remove the key from "options" dictionary
-            else:
-            
-                self.settings["options"] = {}
+            del options[name]
         
+        self.settings["options"] = options
         self.save_settings()
         
         return(gr.update(visible=not is_default))
@@ -711,157 +1004,142 @@ class BuildRight:
         """
         
         # Save updated "options" dictionary
+        options = self.settings.get("options") or {}
         
-        # If "options" dictionary exists in settings
-        if (self.settings.get("options")):
-        
-            self.settings["options"][name] = value
-        
-        # Or if not
-        else:
-        
-            self.settings["options"] = {name: value}
+        # Skip if nothing changed
+        if (name in options and options[name] == value):
+            return
         
+        options[name] = value
+        self.settings["options"] = options
         self.save_settings()
 
-    def settings_model_path_change(self, model_path):
+    def change_model_path(self, model_path):
         """
-        In User Settings -> Models, when changing the model path
+        Change model path and restart Ollama server. Model path is reset if server fails to start.
         
         Input:
             model_path:         Model path
         Output: 
-            gr.update:          Update to model selector 
-            gr.update:          Update to model path
-            gr.update * 2:      Updates to model path buttons
-            gr.update * 4:      Updates to model installation components
+            error:              Error message ("" if successful)
         """
         
-        model_path_old = self.settings["ollama_models"]
-        
         # If path is writable, change model path and enable model installation
         if (os.access(model_path, os.W_OK)):
             
-            # Update model path
-            self.settings["ollama_models"] = model_path
+            error = self.restart_server_with_model_path(model_path, writable=True)
             
-            # Restart Ollama server and re-list models
-            self.server_process.kill()
-            self.server_process.wait()
-            error = self.start_server(raise_error=False)
+        # If not writable, but the path is accessible and contains models, change model path but disable model installation
+        elif (self.is_model_path(model_path)):
             
-            # If error, raise error message, reset everything
-            if (error):
+            error = self.restart_server_with_model_path(model_path, writable=False)
                 
-                # Reset user settings
-                self.settings["ollama_models"] = model_path_old
-                
-                # Re-restart
-                self.server_process.kill()
-                self.server_process.wait()
-                self.start_server(raise_error=False)
+        # If not, keep model path and raise error
+        else:
             
-            # If successfully started, return correctly
-            else:
-                
-                # Update model list
-                self.models = self.list_installed_models()
-                
-                # Save user settings
-                self.save_settings()
-                
-                # Set writability
-                self.gr_rightbar.is_model_path_writable = True
-                
-                # Preload title model on the new server
-                threading.Thread(target=self.preload_title_model, daemon=True).start()
+            # Error message
+            error = "Directory does not exist, you do not have access, or does not contain Ollama model!"
+        
+        # Fill installed model cache (so listing models afterwards does not query the server again)
+        self.list_installed_models()
+        
+        return error
+
+    def restart_server_with_model_path(self, model_path, writable):
+        """
+        Restart Ollama server with given model path. If it fails to start, reset model path and restart again.
+        
+        Input:
+            model_path:         Model path
+            writable:           Whether model path is writable (enables model installation)
+        Output: 
+            error:              Error message ("" if successful)
+        """
+        
+        model_path_old = self.settings["ollama_models"]
+        
+        # Update model path
+        self.settings["ollama_models"] = model_path
+        
+        # Restart Ollama server and re-list models
+        self.stop_server()
+        error = self.start_server(raise_error=False)
+        
+        # If error, raise error message, reset everything
+        if (error):
+            
+            # Reset user settings
+            self.settings["ollama_models"] = model_path_old
             
-        # If not writable
+            # Re-restart
+            self.stop_server()
+            self.start_server(raise_error=False)
+        
+        # If successfully started, return correctly
         else:
             
-            # If the path is accessible and contains models, change model path but disable model installation
-            if (self.is_model_path(model_path)):
+            # Update model list
+            self.models = self.list_installed_models()
+            
+            # Save user settings
+            self.save_settings()
             
-                # Update model path
-                self.settings["ollama_models"] = model_path
-                
-                # Restart Ollama server and re-list models
-                self.server_process.kill()
-                self.server_process.wait()
-                error = self.start_server(raise_error=False)
-                
-                # If error, raise error message, reset everything
-                if (error):
-                    
-                    # Reset user settings
-                    self.settings["ollama_models"] = model_path_old
-                    
-                    # Re-restart
-                    self.server_process.kill()
-                    self.server_process.wait()
-                    self.start_server(raise_error=False)
+            # Set writability
+            self.gr_rightbar.is_model_path_writable = writable
             
-                # If successfully started, return correctly
-                else:
-                    
-                    # Update model list
-                    self.models = self.list_installed_models()
-                    
-                    # Save user settings
-                    self.save_settings()
-                    
-                    # Set writability
-                    self.gr_rightbar.is_model_path_writable = False
-                    
-                    # Preload title model on the new server
-                    threading.Thread(target=self.preload_title_model, daemon=True).start()
-                
-            # If not, reset model path and raise error
-            else:
-                
-                # Error message
-                error = "Directory does not exist, you do not have access, or does not contain Ollama model!"
+            # Preload title model on the new server
+            threading.Thread(target=self.preload_title_model, daemon=True).start()
+        
+        return error
+
+    async def settings_model_path_change(self, model_path):
+        """
+        In User Settings -> Models, when changing the model path
+        
+        Input:
+            model_path:         Model path
+        Output: 
+            gr.update:          Update to model selector 
+            gr.update:          Update to model path
+            gr.update * 2:      Updates to model path buttons
+            gr.update * 4:      Updates to model installation components
+            (Components are first disabled, then updated once the model path is changed)
+        """
+        
+        # First disable components
+        yield self.gr_rightbar.model_components_disabled
+        
+        # Change model path and restart Ollama server (blocking, so run in a worker thread)
+        error = await asyncio.to_thread(self.change_model_path, model_path)
         
         # Raise error
         if (error):
             gr.Warning(error, title="Error")
         
-        # Get model install name and tag lists
-        choices_names = self.generate_settings_model_name_choices()
-        choices_tags = self.generate_settings_model_tag_choices(choices_names[0][1])
-        is_installed = choices_names[0][1]+":"+choices_tags[0][1] in self.models
-        
         # Return
-        return [gr.update(choices=self.list_installed_models(formatted=True), value=self.models[0], interactive=True),     # Model selector
-                gr.update(value=self.settings["ollama_models"], interactive=True),          # Model path textbox
-                gr.update(interactive=True),                                                # Model path save button
-                gr.update(interactive=True),                                                # Model path reset button
-                gr.update(choices=choices_names, value=choices_names[0][1], 
-                          interactive=self.gr_rightbar.is_model_path_writable),             # Model install name list
-                gr.update(choices=choices_tags, value=choices_tags[0][1], 
-                          interactive=self.gr_rightbar.is_model_path_writable),             # Model install tag list
-                gr.update(visible=not is_installed, 
-                          interactive=self.gr_rightbar.is_model_path_writable),             # Model install button
-                gr.update(visible=is_installed,
-                          interactive=self.gr_rightbar.is_model_path_writable)]             # Model remove button
+        yield self.generate_model_settings_updates(self.models[0], self.settings["ollama_models"])
 
-    def settings_update_model_tags(self, name):
+    async def settings_update_model_tags(self, name):
         """
-        Update model tags dropdown choices based on model name
+        Update model tags dropdown choices based on model name, and installation buttons for the first tag
+        (in one event, instead of chaining a buttons update after the tags update)
         
         Input:
             name:               Model name
         Output: 
             gr.update:          Update to model tags
+            gr.update:          Update to model install button
+            gr.update:          Update to model remove button
         """
         
         # Get choices
         choices = self.generate_settings_model_tag_choices(name)
         
         # Return
-        return gr.update(choices=choices, value=choices[0][1])
+        return [gr.update(choices=choices, value=choices[0][1])] + \
+               await self.settings_update_model_buttons(name, choices[0][1])
 
-    def settings_update_model_buttons(self, name, tag):
+    async def settings_update_model_buttons(self, name, tag):
         """
         Update model installation buttons' visibility upon changing selections
         
@@ -880,48 +1158,80 @@ class BuildRight:
         return [gr.update(visible=not is_installed),
                 gr.update(visible=is_installed)]
 
-    def settings_model_install_remove(self, name, tag, action):
+    def format_pull_status(self, status, percent):
+        """
+        Format model pull progress for display
+        
+        Input:
+            status:             Status reported by Ollama
+            percent:            Percentage progress (None if not available)
+        Output: 
+            status:             Formatted status
+        """
+        return status if percent is None else f"{status} ( **{percent}%** )"
+
+    async def settings_model_install_remove(self, name, tag, action):
         """
-        In User Settings -> Models, install or remove a model
+        In User Settings -> Models, install or remove a model (through the async Ollama client, on the event loop)
         
         Input:
             name:               Model name
             tag:                Model tag
             action:             "install" or "remove"
         Output: 
+            gr.update * 8:      Updates to model components (disabled first, updated when done)
             status:             Status stream
         """
         
+        # First disable components
+        yield self.gr_rightbar.model_components_disabled + [gr.update()]
+        
         try:
             
             if (action == "install"):
             
+                # Last yielded progress (progress is only yielded when it visibly changes, at most every 0.1 second)
+                (last_status, last_percent, last_emit, pending) = (None, None, 0, None)
+                
                 # Pull selected model
-                for progress in self.client.pull(name+":"+tag, stream=True):
+                async for progress in await self.async_client.pull(name+":"+tag, stream=True):
                     
                     # Get status
                     status = progress.get("status")
                     
-                    # Get percentage progress for big blobs ("digest" exists)
-                    if progress.get("digest"):
+                    # Get percentage progress for big blobs ("digest" exists, and total size is known)
+                    percent = None
+                    total = progress.get("total")
+                    if (total and progress.get("digest")):
                         
-                        completed=progress.get("completed") if progress.get("completed") else 0
-                        status += " ( **{:.0%}** )".format(completed / progress.get("total"))
+                        percent = round((progress.get("completed") or 0) * 100 / total)
+                    
+                    # Skip unchanged progress, and percentage changes within 0.1 second (new status is always shown)
+                    now = time.monotonic()
+                    if (status == last_status and (percent == last_percent or now - last_emit < 0.1)):
+                        pending = (status, percent) if percent != last_percent else pending
+                        continue
+                    (last_status, last_percent, last_emit, pending) = (status, percent, now, None)
                     
                     # Yield progress
-                    yield status
+                    yield self.gr_rightbar.model_components_unchanged + [self.format_pull_status(status, percent)]
+                
+                # Yield final progress if skipped
+                if (pending):
+                    yield self.gr_rightbar.model_components_unchanged + [self.format_pull_status(*pending)]
                     
             elif (action == "remove"):
             
                 # Remove selected model
-                self.client.delete(name+":"+tag)
+                await self.async_client.delete(name+":"+tag)
                 
             else:
             
                 gr.Warning("Invalid action!", title="Error")
             
-            # Update model list
-            self.models = self.list_installed_models()
+            # Update model list (blocking, so run in a worker thread)
+            self.invalidate_models_cache()
+            self.models = await asyncio.to_thread(self.list_installed_models)
                 
             # Reset user settings
             self.settings["model_selected"] = self.models[0]
@@ -932,7 +1242,7 @@ class BuildRight:
             gr.Warning(str(e), title="Error")
                 
         # Return
-        yield ""
+        yield self.settings_model_install_after() + [""]
 
     def settings_model_install_after(self):
         """
@@ -947,16 +1257,35 @@ class BuildRight:
             gr.update * 4:      Updates to model installation components
         """
         
+        return self.generate_model_settings_updates(self.settings["model_selected"])
+
+    def generate_model_settings_updates(self, model_selected, model_path=None):
+        """
+        Generate updates to (re-enabled) model components, after changing model path or installing / removing model
+        
+        Input:
+            model_selected:     Model to select in model selector
+            model_path:         Model path to show in model path textbox (Default: None, keep current text)
+        Output: 
+            gr.update:          Update to model selector 
+            gr.update:          Update to model path
+            gr.update * 2:      Updates to model path buttons
+            gr.update * 4:      Updates to model installation components
+        """
+        
         # Get model install name and tag lists
         choices_names = self.generate_settings_model_name_choices()
         choices_tags = self.generate_settings_model_tag_choices(choices_names[0][1])
         is_installed = choices_names[0][1]+":"+choices_tags[0][1] in self.models
+        
+        # Model path textbox (only set text if given)
+        model_path_update = gr.update(interactive=True) if model_path is None else gr.update(value=model_path, interactive=True)
                 
         # Return
         return [gr.update(choices=self.list_installed_models(formatted=True), \
-                          value=self.settings["model_selected"], \
+                          value=model_selected, \
                           interactive=True),                                                # Model selector
-                gr.update(interactive=True),                                                # Model path textbox
+                model_path_update,                                                          # Model path textbox
                 gr.update(interactive=True),                                                # Model path save button
                 gr.update(interactive=True),                                                # Model path reset button
                 gr.update(choices=choices_names, value=choices_names[0][1], 
@@ -978,32 +1307,10 @@ class BuildRight:
             None
         """
         
-        event_handler(                                      # First disable components
-            fn=lambda : [gr.update(interactive=False)]*8,
-            inputs=[],
-            outputs=[
-                self.gr_main.model_dropdown,
-                self.gr_rightbar.model_path_text,
-                self.gr_rightbar.model_path_save,
-                self.gr_rightbar.model_path_reset,
-                self.gr_rightbar.model_install_names,
-                self.gr_rightbar.model_install_tags,
-                self.gr_rightbar.model_install_btn,
-                self.gr_rightbar.model_remove_btn
-            ]
-        ).then(                                             # Then handle model path change
+        event_handler(                                      # Disable components, then handle model path change
             fn=self.settings_model_path_change,
             inputs=[self.gr_rightbar.model_path_text],
-            outputs=[
-                self.gr_main.model_dropdown,
-                self.gr_rightbar.model_path_text,
-                self.gr_rightbar.model_path_save,
-                self.gr_rightbar.model_path_reset,
-                self.gr_rightbar.model_install_names,
-                self.gr_rightbar.model_install_tags,
-                self.gr_rightbar.model_install_btn,
-                self.gr_rightbar.model_remove_btn
-            ]
+            outputs=self.gr_rightbar.model_components
         )
 
     def workflow_install_remove_model(self, event_handler, action):
@@ -1017,40 +1324,14 @@ class BuildRight:
             None
         """
         
-        event_handler(                                      # First disable components
-            fn=lambda : [gr.update(interactive=False)]*8,
-            inputs=[],
-            outputs=[
-                self.gr_main.model_dropdown,
-                self.gr_rightbar.model_path_text,
-                self.gr_rightbar.model_path_save,
-                self.gr_rightbar.model_path_reset,
-                self.gr_rightbar.model_install_names,
-                self.gr_rightbar.model_install_tags,
-                self.gr_rightbar.model_install_btn,
-                self.gr_rightbar.model_remove_btn
-            ]
-        ).then(                                             # Then install / remove model
+        event_handler(                                      # Disable components, install / remove model, then update components
             fn=self.settings_model_install_remove,
             inputs=[
                 self.gr_rightbar.model_install_names, 
                 self.gr_rightbar.model_install_tags,
                 gr.State(action)
             ],
-            outputs=[self.gr_rightbar.model_install_status]
-        ).then(                                             # Then update disabled components
-            fn=self.settings_model_install_after,
-            inputs=[],
-            outputs=[
-                self.gr_main.model_dropdown,
-                self.gr_rightbar.model_path_text,
-                self.gr_rightbar.model_path_save,
-                self.gr_rightbar.model_path_reset,
-                self.gr_rightbar.model_install_names,
-                self.gr_rightbar.model_install_tags,
-                self.gr_rightbar.model_install_btn,
-                self.gr_rightbar.model_remove_btn
-            ]
+            outputs=self.gr_rightbar.model_components + [self.gr_rightbar.model_install_status]
         )
 
     #------------------------------------------------------------------
@@ -1120,6 +1401,22 @@ class BuildRight:
                 outputs = []
             )
 
+    def model_choices(self):
+        """
+        Get cache of model dropdown choices. The cache is cleared whenever remote or installed models change
+        (both lists are replaced, never modified, when refreshed).
+        
+        Input:
+            None
+        Output: 
+            cache:          Dictionary like {None: name choices, "model_name": tag choices, ...}
+        """
+        if (self.model_choices_cache is None or \
+            self.model_choices_cache[0] is not self.remote_models or \
+            self.model_choices_cache[1] is not self.models):
+            self.model_choices_cache = (self.remote_models, self.models, {})
+        return self.model_choices_cache[2]
+
     def generate_settings_model_name_choices(self):
         """
         Generate dropdown choices for remote model names
@@ -1127,23 +1424,27 @@ class BuildRight:
         Input:
             None
         Output: 
-            [(key, val)]:   A list of (key, value) pair, and add "✅" to keys if installed
+            [(key, val)]:   A list of (key, value) pair, and add "✅" to keys if installed (cached, do not modify)
         """
         
-        # List model names (values)
-        values = sorted(list(self.remote_models.keys()))
+        cache = self.model_choices()
+        if (None not in cache):
         
-        # Generate dropdown choices
-        res = []
-        dict_installed_models = self.dict_installed_models()
-        for val in values:
-            if val in dict_installed_models:
-                res.append((val + " ✅", val))
-            else:
-                res.append((val, val))
+            # List model names (values)
+            values = sorted(list(self.remote_models.keys()))
+            
+            # Generate dropdown choices
+            res = []
+            dict_installed_models = self.dict_installed_models()
+            for val in values:
+                if val in dict_installed_models:
+                    res.append((val + " ✅", val))
+                else:
+                    res.append((val, val))
+            cache[None] = res
         
         # Return
-        return(res)
+        return(cache[None])
 
     def generate_settings_model_tag_choices(self, name):
         """
@@ -1152,23 +1453,27 @@ class BuildRight:
         Input:
             name:           Model name
         Output: 
-            [(key, val)]:   A list of (key, value) pair, and add "✅" to keys if installed
+            [(key, val)]:   A list of (key, value) pair, and add "✅" to keys if installed (cached, do not modify)
         """
         
-        # List model names (values)
-        values = self.remote_models[name]
+        cache = self.model_choices()
+        if (name not in cache):
         
-        # Generate dropdown choices
-        res = []
-        dict_installed_tags = self.dict_installed_models().get(name) if self.dict_installed_models().get(name) else []
-        for val in values:
-            if val in dict_installed_tags:
-                res.append((val + " ✅", val))
-            else:
-                res.append((val, val))
+            # List model names (values)
+            values = self.remote_models[name]
+            
+            # Generate dropdown choices
+            res = []
+            dict_installed_tags = self.dict_installed_models().get(name) or []
+            for val in values:
+                if val in dict_installed_tags:
+                    res.append((val + " ✅", val))
+                else:
+                    res.append((val, val))
+            cache[name] = res
         
         # Return
-        return(res)
+        return(cache[name])
 
     def build_right(self):
         """
@@ -1297,6 +1602,21 @@ class BuildRight:
             None
         """
         
+        # Components updated by model path change & model install / remove, and their "disabled" / "unchanged" updates
+        #   (Built once. Safe to reuse since they contain no "value" key, which Gradio pops from update dictionaries)
+        self.gr_rightbar.model_components = [
+            self.gr_main.model_dropdown,
+            self.gr_rightbar.model_path_text,
+            self.gr_rightbar.model_path_save,
+            self.gr_rightbar.model_path_reset,
+            self.gr_rightbar.model_install_names,
+            self.gr_rightbar.model_install_tags,
+            self.gr_rightbar.model_install_btn,
+            self.gr_rightbar.model_remove_btn
+        ]
+        self.gr_rightbar.model_components_disabled = [gr.update(interactive=False)] * len(self.gr_rightbar.model_components)
+        self.gr_rightbar.model_components_unchanged = [gr.update()] * len(self.gr_rightbar.model_components)
+        
         # Change model path (hit enter)
         self.workflow_change_model_path(self.gr_rightbar.model_path_text.submit)
         
@@ -1305,10 +1625,11 @@ class BuildRight:
         
         # Reset model path
         self.workflow_change_model_path(
-            self.gr_rightbar.model_path_reset.click(            # First update textbox to default
-                fn=lambda : self.args.ollama_models,
+            self.gr_rightbar.model_path_reset.click(            # First update textbox to default (in browser, no server round trip)
+                fn=None,
                 inputs=[],
-                outputs=[self.gr_rightbar.model_path_text]
+                outputs=[self.gr_rightbar.model_path_text],
+                js=f"() => {json.dumps(self.args.ollama_models)}"
             ).then                                              # Then execute the workflow
         )
         
@@ -1316,12 +1637,8 @@ class BuildRight:
         self.gr_rightbar.model_install_names.change(            # Force update when system trigger change
             fn=self.settings_update_model_tags,
             inputs=[self.gr_rightbar.model_install_names],
-            outputs=[self.gr_rightbar.model_install_tags]
-        ).then(
-            fn=self.settings_update_model_buttons,
-            inputs=[self.gr_rightbar.model_install_names,
-                    self.gr_rightbar.model_install_tags],
-            outputs=[self.gr_rightbar.model_install_btn,
+            outputs=[self.gr_rightbar.model_install_tags,
+                     self.gr_rightbar.model_install_btn,
                      self.gr_rightbar.model_remove_btn]
         )
         
@@ -1358,9 +1675,9 @@ class BuildMain:
     # Listeners
     #------------------------------------------------------------------
 
-    def stream_chat(self):
+    async def stream_chat(self):
         """
-        Stream chat (invoked by new/edit/retry).
+        Stream chat (invoked by new/edit/retry). Runs on the event loop, streaming through the async Ollama client.
         
         Input:
             None
@@ -1372,31 +1689,19 @@ class BuildMain:
         # Failsafe: Only stream while is_streaming is True
         if self.is_streaming:
         
-            # Make a copy of options for pre-processing
-            options = self.settings.get("options").copy() if self.settings.get("options") else {}
-            
-            # Pre-process "stop" sequence
-            if (options.get("stop")):
-                options["stop"] = options["stop"].split(",")
-            
-            # Pre-process "think" option
-            think = None
-            if ("think" in options):
-                think = options["think"]
-                del options["think"]
-                if (isinstance(think, str) and self.settings["model_selected"].split(":")[0] != "gpt-oss"):
-                    think = True
-                    
-            # Pre-process "keep_alive" option
-            keep_alive = None
-            if ("keep_alive" in options):
-                keep_alive = options["keep_alive"]
-                del options["keep_alive"]
+            # Stop event of this stream (set by stop_stream_chat())
+            self.stop_event = asyncio.Event()
+        
+            # Pre-processed options (cached until user settings change)
+            (options, think, keep_alive) = self.stream_options()
+
+            # Format chat history for streaming (may convert attachments, so run in a worker thread)
+            messages = await asyncio.to_thread(self.chat_history_stream)
 
             # Generate next chat results
-            response = self.client.chat(
+            response = await self.async_client.chat(
                 model = self.settings["model_selected"],
-                messages = self.chat_history_stream(),      # Using formatted chat history for streaming
+                messages = messages,
                 stream = True,
                 think = think,
                 keep_alive = keep_alive,
@@ -1408,61 +1713,125 @@ class BuildMain:
             
                 # Reset thinking flag
                 is_thinking = False
+                
+                # Response buffers: chunks are collected in lists and only joined into chat history when displayed
+                #   (Appending to the string itself copies the whole response on every chunk)
+                content_parts = [self.chat_history[-1]["content"]]
+                thinking_parts = [self.chat_history[-1]["thinking"]]
+                
+                # Detection windows for "<think>" / "</think>", so the whole response is never re-scanned:
+                #   content_head:   Beginning of "content" while it is too short to tell whether it starts with "<think>" (None once decided)
+                #   thinking_tail:  Last 8 non-whitespace-trailing characters of "thinking", plus trailing whitespace
+                content_head = self.chat_history[-1]["content"]
+                thinking_tail = self.chat_history[-1]["thinking"]
+                
+                # Display is refreshed at most once per frame (instead of once per chunk)
+                last_emit = time.monotonic()
+                
+                # Display of previous messages (unchanged while streaming, so only formatted once)
+                display_prefix = self.chat_history_display_prefix()
 
                 # Stream results in chunks while not interrupted
-                for chunk in response:
-                
-                    # Breake if interrupted
-                    if not self.is_streaming:
-                        break
+                async for chunk in until_stopped(response, self.stop_event):
+                    
+                    # Thinking state before this chunk
+                    was_thinking = is_thinking
                     
                     # Handle reasoning
                     
                     # If "thinking" attribute is not empty, always put it in "thinking"
                     if (chunk.message.thinking):
                     
-                        self.chat_history[-1]["thinking"] += chunk.message.thinking
+                        thinking_parts.append(chunk.message.thinking)
+                        thinking_tail += chunk.message.thinking
                         
                     # Otherwise, check "content" attribute
                     else:
                     
+                        delta = chunk.message.content or ""
+                    
                         # If "is_thinking" is on
                         if (is_thinking):
                         
                             # Append "content" to "thinking"
-                            self.chat_history[-1]["thinking"] += chunk.message.content or ""
+                            thinking_parts.append(delta)
+                            thinking_tail += delta
                             
                             # If "thinking" ends with "</think>", turn off "is_thinking".
                             #   Following chunks will be added to "content"
-                            if (self.chat_history[-1]["thinking"].rstrip()[-8:] == "</think>"):
+                            if (thinking_tail.rstrip().endswith("</think>")):
                             
                                 is_thinking = False
-                                self.chat_history[-1]["thinking"] = self.chat_history[-1]["thinking"].rstrip()[:-8]
+                                
+                                # Drop "</think>" and trailing whitespace from the end of the buffer (without joining it)
+                                drop = len(thinking_tail) - len(thinking_tail.rstrip()) + 8
+                                while (drop > 0):
+                                    part = thinking_parts.pop()
+                                    if (len(part) > drop):
+                                        thinking_parts.append(part[:-drop])
+                                    drop -= len(part)
+                                
+                                # Reset detection windows ("content" is still empty)
+                                thinking_tail = ""
+                                content_head = ""
                             
                         # If "is_thinking" is off
                         else:
                         
                             # Append "content" to "content"
-                            self.chat_history[-1]["content"] += chunk.message.content or ""
+                            content_parts.append(delta)
                             
                             # If "content" starts with "<think>", turn on "is_thinking" and move "content" to "thinking". 
                             #   Following chunks will be added to "thinking"
-                            if (self.chat_history[-1]["content"].lstrip()[:7] == "<think>"):
+                            if (content_head is not None):
                             
-                                is_thinking = True
-                                self.chat_history[-1]["thinking"] = self.chat_history[-1]["content"].lstrip()[7:]
-                                self.chat_history[-1]["content"] = ""
+                                content_head += delta
+                                
+                                if (content_head.lstrip().startswith("<think>")):
+                                
+                                    is_thinking = True
+                                    thinking_parts = [content_head.lstrip()[7:]]
+                                    thinking_tail = thinking_parts[0]
+                                    content_parts = [""]
+                                    content_head = ""
+                                
+                                # Long enough to never start with "<think>"
+                                elif (len(content_head.lstrip()) >= 7):
+                                
+                                    content_head = None
+                    
+                    # Trim "</think>" detection window
+                    thinking_tail = thinking_tail[max(len(thinking_tail.rstrip()) - 8, 0):]
+                    
+                    # Yield results once per frame, or when thinking starts / ends
+                    now = time.monotonic()
+                    if (now - last_emit >= self.stream_frame_interval or is_thinking != was_thinking):
                     
-                    # Yield results
-                    #yield self.chat_history, gr.update(value="", submit_btn=False, stop_btn=True)
-                    yield self.chat_history_display(), gr.update(value="", submit_btn=False, stop_btn=True)
+                        last_emit = now
+                    
+                        # Join buffers into chat history
+                        self.chat_history[-1]["content"] = "".join(content_parts)
+                        self.chat_history[-1]["thinking"] = "".join(thinking_parts)
+                        
+                        # Yield results
+                        #yield self.chat_history, gr.update(value="", submit_btn=False, stop_btn=True)
+                        yield display_prefix + self.chat_message_display(self.chat_history[-1]), UPDATE_INPUT_STREAMING.copy()
+                
+                # Join remaining chunks into chat history (displayed by the final update below)
+                self.chat_history[-1]["content"] = "".join(content_parts)
+                self.chat_history[-1]["thinking"] = "".join(thinking_parts)
             
             # If error occurs
             except Exception as error: 
                 
                 self.chat_history[-1]["content"] = "[Error] An error has occurred! Please see error message and and try again!"
                 gr.Warning(str(error), title="Error")
-                yield self.chat_history_display(), gr.update(value="", submit_btn=False, stop_btn=True)
+                yield self.chat_history_display(), UPDATE_INPUT_STREAMING.copy()
+            
+            # Close response stream (if interrupted, failed or cancelled), releasing the connection
+            finally:
+                
+                await response.aclose()
         
         # Once finished, set streaming to False
         self.is_streaming = False
@@ -1471,10 +1840,53 @@ class BuildMain:
         if (not self.chat_history[-1]["thinking"]):
             del self.chat_history[-1]["thinking"]
         
+        # Mark chat history as modified (for saving)
+        cs.touch_chat(self.chat_id)
+        
         # Final update components
-        yield self.chat_history_display(), gr.update(value="", submit_btn=True, stop_btn=False)
+        yield self.chat_history_display(), UPDATE_INPUT_IDLE.copy()
 
-    def stop_stream_chat(self):
+    def stream_options(self):
+        """
+        Pre-process user options for streaming. Result is cached until user settings are saved or selected model changes.
+        
+        Input:
+            None
+        Output: 
+            options:            Options for Ollama (do not modify)
+            think:              "think" option
+            keep_alive:         "keep_alive" option
+        """
+        
+        model = self.settings["model_selected"]
+        if (self.stream_options_cache is None or self.stream_options_cache[0] != model):
+        
+            # Make a copy of options for pre-processing
+            options = self.settings.get("options").copy() if self.settings.get("options") else {}
+            
+            # Pre-process "stop" sequence
+            if (options.get("stop")):
+                options["stop"] = options["stop"].split(",")
+            
+            # Pre-process "think" option
+            think = None
+            if ("think" in options):
+                think = options["think"]
+                del options["think"]
+                if (isinstance(think, str) and model.split(":")[0] != "gpt-oss"):
+                    think = True
+                    
+            # Pre-process "keep_alive" option
+            keep_alive = None
+            if ("keep_alive" in options):
+                keep_alive = options["keep_alive"]
+                del options["keep_alive"]
+            
+            self.stream_options_cache = (model, options, think, keep_alive)
+        
+        return self.stream_options_cache[1:]
+
+    async def stop_stream_chat(self):
         """
         Stop streaming.
         
@@ -1485,11 +1897,13 @@ class BuildMain:
             user_input:         Update user input field to "" and button face
         """
         
-        # Set streaming to False
+        # Set streaming to False, and interrupt stream immediately
         self.is_streaming = False
+        if (self.stop_event):
+            self.stop_event.set()
         
         # Update components
-        yield self.chat_history_display(), gr.update(value="", submit_btn=True, stop_btn=False)
+        yield self.chat_history_display(), UPDATE_INPUT_IDLE.copy()
 
     def new_message(self, user_input):
         """
@@ -1525,13 +1939,39 @@ class BuildMain:
             
         # Append user message to history
         self.chat_history.append(user_message)
-        self.chat_history.append({"role": "assistant", "content": "", "thinking": ""})
+        self.chat_history.append(new_assistant_message())
+        cs.touch_chat(self.chat_id)
             
         # Set streaming to True
         self.is_streaming = True
         
         # Update components
-        yield self.chat_history_display(), gr.update(value="", submit_btn=False, stop_btn=True)
+        yield self.chat_history_display(), UPDATE_INPUT_STREAMING.copy()
+
+    def history_index(self, index):
+        """
+        Convert a chatbot message index to chat history index (attachments are displayed as extra chatbot messages).
+        
+        Input:
+            index:              Chatbot message index
+        Output: 
+            index:              Chat history index
+        """
+        
+        # Extend row cache to messages appended since last call
+        #   self.chat_rows[i] is the chatbot index of the last row displayed for chat history message i
+        for message in self.chat_history[len(self.chat_rows):]:
+            if (message.get("images")):
+                rows = 2
+            elif (message.get("files")):
+                rows = len(message["files"]) + 1
+            else:
+                rows = 1
+            self.chat_rows.append((self.chat_rows[-1] if self.chat_rows else -1) + rows)
+        
+        # Find the message displayed at this index, and subtract extra rows displayed up to it
+        i = bisect.bisect_left(self.chat_rows, index)
+        return index - (self.chat_rows[i] - i)
 
     def retry(self, retry_data: gr.RetryData):
         """
@@ -1545,23 +1985,21 @@ class BuildMain:
         """
         
         # Find the correct index
-        (i, index) = (0, retry_data.index)
-        while (i <= index):
-            if (self.chat_history[i].get("images")):
-                index -= 1
-            elif (self.chat_history[i].get("files")):
-                index -= len(self.chat_history[i]["files"])
-            i += 1
+        index = self.history_index(retry_data.index)
         
         # Revert to previous user message
-        self.chat_history[:] = self.chat_history[:index+1]
-        self.chat_history.append({"role": "assistant", "content": "", "thinking": ""})
+        del self.chat_history[index+1:]
+        del self.chat_rows[index+1:]
+        del self.chat_stream[index+1:]
+        del self.chat_display[index+1:]
+        self.chat_history.append(new_assistant_message())
+        cs.touch_chat(self.chat_id)
             
         # Set to streaming and continue
         self.is_streaming = True
         
         # Update components
-        yield self.chat_history_display(), gr.update(value="", submit_btn=False, stop_btn=True)
+        yield self.chat_history_display(), UPDATE_INPUT_STREAMING.copy()
 
     def edit(self, edit_data: gr.EditData):
         """
@@ -1575,24 +2013,22 @@ class BuildMain:
         """
         
         # Find the correct index
-        (i, index) = (0, edit_data.index)
-        while (i <= index):
-            if (self.chat_history[i].get("images")):
-                index -= 1
-            elif (self.chat_history[i].get("files")):
-                index -= len(self.chat_history[i]["files"])
-            i += 1
-        
-        # Revert to edited user message
-        self.chat_history[:] = self.chat_history[:index+1]
+        index = self.history_index(edit_data.index)
+        
+        # Revert to edited user message (formatted message is dropped as well, as its content changes)
+        del self.chat_history[index+1:]
+        del self.chat_rows[index+1:]
+        del self.chat_stream[index:]
+        del self.chat_display[index:]
         self.chat_history[-1]["content"] = edit_data.value
-        self.chat_history.append({"role": "assistant", "content": "", "thinking": ""})
+        self.chat_history.append(new_assistant_message())
+        cs.touch_chat(self.chat_id)
             
         # Set to streaming and continue
         self.is_streaming = True
         
         # Update components
-        yield self.chat_history_display(), gr.update(value="", submit_btn=False, stop_btn=True)
+        yield self.chat_history_display(), UPDATE_INPUT_STREAMING.copy()
 
     def select_model(self, model_selected):
         """
@@ -1608,7 +2044,7 @@ class BuildMain:
         self.settings["model_selected"] = model_selected
         self.save_settings()
 
-    def enable_components(self, interactive=True):
+    async def enable_components(self, interactive=True):
         """
         Enable or disable components.
         
@@ -1637,15 +2073,11 @@ class BuildMain:
                 inputs=[],
                 outputs=[self.gr_leftbar.chat_selector]
             ).then(
-                fn=lambda: self.enable_components(True), 
+                fn=partial(self.enable_components, True),
                                                     # Enable certain components
                 inputs=[],
                 outputs=[self.gr_leftbar.chat_selector, \
                          self.gr_leftbar.new_btn]
-            ).then(
-                fn=self.save_chat_history,          # Save chat history
-                inputs=[],
-                outputs=[]
             ).then(
                 fn=None,
                 inputs=[],
@@ -1666,7 +2098,7 @@ class BuildMain:
         return (
             self.workflow_after_streaming(
                 event_handler.then(
-                    fn=lambda: self.enable_components(False),
+                    fn=partial(self.enable_components, False),
                                                         # Disable certain components
                     inputs=[],
                     outputs=[self.gr_leftbar.chat_selector, \
@@ -1738,6 +2170,7 @@ class BuildMain:
             
         # Footer
         with gr.Column(
+            elem_id="gr-user-input-container",
             elem_classes=["no-shrink", "main-max-width"]
         ):
             
@@ -1798,25 +2231,6 @@ class BuildMain:
             )
         )
         
-        # User input: Change textarea height
-        self.gr_main.user_input.change(
-            fn=None,
-            inputs=[],
-            outputs=[],
-            js="""
-            function() {
-                const container = document.getElementById('gr-chatbot-container');
-                const header = document.getElementById('gr-main-header');
-                const inputBox = document.getElementById('gr-user-input');
-                if (container && inputBox && header) {
-                    const inputHeight = inputBox.offsetHeight;
-                    const headerHeight = header.offsetHeight;
-                    container.style.height = `calc(100dvh - ${inputHeight + headerHeight + 70}px)`;
-                }
-            }
-            """
-        )
-        
         # User input: Stop
         self.workflow_after_streaming( 
             self.gr_main.user_input.stop(
@@ -1857,15 +2271,42 @@ class OllamaOnDemandUI(MiscUtils, BuildLeft, BuildRight, BuildMain):
         # Command-line arguments
         self.args = args
         
-        # Stop event (for streaming interruption)
-        self.is_streaming = False
+        # Streaming state
+        self.is_streaming = False                   # Whether a stream is requested (cleared to interrupt)
+        self.stop_event = None                      # Stop event of current stream (see stop_stream_chat())
+        
+        # Last built chat selector: (chat titles, (chat ID, interactive), HTML code)
+        self.chat_selector_cache = None
+        
+        # Minimum interval between streamed display updates (seconds)
+        self.stream_frame_interval = 0.05
+        
+        # Pre-processed options for streaming: (model, options, think, keep_alive) (see stream_options())
+        self.stream_options_cache = None
+        
+        # Maximum number of generated chat titles cached in user settings
+        self.title_cache_size = 100
+        
+        # Debounced chat history / user settings saving
+        self.save_delay = 0.5                       # Coalescing window (seconds)
+        self.save_pending = False                   # Whether a write is queued
+        self.settings_save_pending = False          # Whether a user settings write is queued
+        self.settings_snapshot = None               # User settings to write
+        self.save_lock = threading.Lock()           # Guards save_pending, settings_save_pending, settings_snapshot
+        self.save_executor = ThreadPoolExecutor(max_workers=1)
+                                                    # Save worker (single worker keeps writes in order)
         
         # Chat session(s)
+        self.chat_id = None
         self.load_chat_history()
-        self.update_current_chat(0)                 # Load chat at 0 index. Also initialize:
-                                                    #   self.chat_index     - Current chat index
+        self.update_current_chat(cs.get_chat_titles()[0][0])
+                                                    # Load the newest chat. Also initialize:
+                                                    #   self.chat_id        - Current chat ID
                                                     #   self.chat_title     - Current chat title
                                                     #   self.chat_history   - Current chat history
+                                                    #   self.chat_rows      - Chatbot row cache
+                                                    #   self.chat_stream    - Formatted messages cache
+                                                    #   self.chat_display   - Displayed messages cache
         
         # Clean up orphaned cached files
         self.cleanup_cache()
@@ -1883,12 +2324,18 @@ class OllamaOnDemandUI(MiscUtils, BuildLeft, BuildRight, BuildMain):
             self.save_settings()
         
         # Start Ollama server and save client(s)
+        self.models_cache = None                            # Installed models reported by server (see list_installed_models())
+        self.models_cache_time = 0                          # Time when installed models were last queried (time.monotonic())
+        self.models_cache_max_age = 5                       # Maximum age (seconds) of installed models on page load
+        self.server_log_size = 200                          # Number of server log lines kept for diagnostics
         self.start_server()
         self.client = self.get_client()
+        self.async_client = self.get_client("ollama_async")
         
         # Get models
         self.models = self.list_installed_models()          # Installed models (List)
         self.remote_models = self.dict_remote_models()      # Remote models (Dict)
+        self.model_choices_cache = None                     # Model dropdown choices (see model_choices())
         if (not self.settings.get("model_selected") in self.models):
             self.settings["model_selected"] = self.models[0]
         
@@ -1928,34 +2375,100 @@ class OllamaOnDemandUI(MiscUtils, BuildLeft, BuildRight, BuildMain):
         env["OLLAMA_MODELS"] = self.settings["ollama_models"]
         env["OLLAMA_SCHED_SPREAD"] = "1"
 
-        # Start the Ollama server
+        # Start the Ollama server (installed models may differ from the previous server)
+        self.invalidate_models_cache()
         print("Starting Ollama server on " + self.args.ollama_host)
         self.server_process = subprocess.Popen(
             ["ollama", "serve"],
             env=env,
             stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL
+            stderr=subprocess.PIPE
         )
         
+        # Keep the last lines of server log (for diagnostics), drained in a background thread so the pipe never fills up
+        self.server_log = deque(maxlen=self.server_log_size)
+        self.server_listening = threading.Event()
+        self.server_log_reader = threading.Thread(
+            target=self.read_server_log,
+            args=(self.server_process, self.server_log, self.server_listening),
+            daemon=True
+        )
+        self.server_log_reader.start()
+        
         # Wait until the server starts
+        #   (Probe through one session, so probes reuse the connection. Probe interval backs off exponentially,
+        #    from 0.025 to 0.5 second, so a quick start is detected almost at once without polling fast for a slow one.
+        #    A short connect timeout keeps a hung connection from delaying detection)
+        #   (Probe "/api/tags", which lists models from storage, so the server is ready to load models, not only listening)
+        #   (Sleeping between probes is cut short once the server logs that it is listening, or exits)
         url = "http://" + self.args.ollama_host if not self.args.ollama_host.startswith(("http://", "https://")) else self.args.ollama_host
-        for _ in range(60): 
-            
-            try:
-                if requests.get(url).ok:
-                    print("Ollama server is running")
-                    return ""
-            except:
-                pass
-            print("Waiting for Ollama server to start...")
-            time.sleep(1)
-            
+        url = url.rstrip("/") + "/api/tags"
+        (deadline, next_print, delay) = (time.monotonic() + 60, 0, 0.025)
+        with requests.Session() as session:
+            while (time.monotonic() < deadline): 
+                
+                try:
+                    response = session.get(url, timeout=(0.25, 5))     # (Connect, read) timeout: listing models may take a while on slow storage
+                    if (response.ok and "models" in response.json()):
+                        print("Ollama server is running")
+                        return ""
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.JSONDecodeError):
+                    pass
+                
+                # Stop waiting if the server has exited (e.g. it cannot use the model path)
+                if (self.server_process.poll() is not None):
+                    self.server_log_reader.join(timeout=1)
+                    break
+                
+                if (time.monotonic() >= next_print):
+                    print("Waiting for Ollama server to start...")
+                    next_print = time.monotonic() + 1
+                if (self.server_listening.wait(delay)):
+                    self.server_listening.clear()
+                delay = min(delay * 1.5, 0.5)
+        
+        # Error message, with the end of server log
+        if (self.server_process.poll() is None):
+            error = "Ollama server failed to start in 1 min. Something is wrong."
         else:
+            error = "Ollama server exited while starting. Something is wrong."
+        log = b"".join(self.server_log.copy()).decode(errors="replace")
+        if (log):
+            error += "\n\nServer log (last lines):\n" + "".join(log.splitlines(keepends=True)[-5:])
             
-            if (raise_error):
-                raise RuntimeError("Ollama server failed to start in 1 min. Something is wrong.")
-            else:
-                return("Ollama server failed to start in 1 min. Something is wrong.")
+        if (raise_error):
+            raise RuntimeError(error)
+        else:
+            return(error)
+
+    def read_server_log(self, process, log, listening):
+        """
+        Read Ollama server log (invoked in a background thread until the server exits).
+        
+        Input:
+            process:    Ollama server process
+            log:        Log lines (deque, last lines are kept)
+            listening:  Event set when the server starts listening, or exits
+        Output:
+            None
+        """
+        for line in iter(process.stderr.readline, b""):
+            log.append(line)
+            if (b"Listening on" in line):
+                listening.set()
+        listening.set()
+
+    def stop_server(self):
+        """
+        Stop Ollama Server. The new server binds the same host and port, so it is only started after the old one exits.
+        
+        Input:
+            None
+        Output:
+            None
+        """
+        self.server_process.kill()
+        self.server_process.wait()
 
     def get_client(self, type="ollama"):
         """
@@ -1964,12 +2477,15 @@ class OllamaOnDemandUI(MiscUtils, BuildLeft, BuildRight, BuildMain):
         Input:
             type: Client type. 
                 - "ollama": Ollama client (Default)
+                - "ollama_async": Ollama async client (for streaming on the event loop)
                 - "langchain": LangChain client (To be added)
         Output:
             client: Client object
         """
         if type=="ollama":
             return ollama.Client(host=self.args.ollama_host)
+        elif type=="ollama_async":
+            return ollama.AsyncClient(host=self.args.ollama_host)
 
     def preload_title_model(self):
         """
@@ -2000,6 +2516,7 @@ class OllamaOnDemandUI(MiscUtils, BuildLeft, BuildRight, BuildMain):
                     print(f"Title model '{self.args.title_model}' pulled successfully.")
                     
                     # Refresh installed model list
+                    self.invalidate_models_cache()
                     self.models = self.list_installed_models()
                     
                 except Exception as e:
@@ -2031,7 +2548,7 @@ class OllamaOnDemandUI(MiscUtils, BuildLeft, BuildRight, BuildMain):
         set_icon = f"<link rel='icon' type='image/png' href='gradio_api/file={self.current_path}/images/logo.png'>\n\n"
         
         with gr.Blocks(
-            css_paths   = self.current_path+'/grblocks.css',
+            css         = read_css(self.current_path+'/grblocks.css'),
             title       = "Ollama OnDemand",
             head        = set_icon,
             head_paths  = self.current_path+'/head.html'
@@ -2081,6 +2598,9 @@ class OllamaOnDemandUI(MiscUtils, BuildLeft, BuildRight, BuildMain):
                     // Collapse all thinking tags
                     collapse_thinking();
                     
+                    // Resize chatbot with user input
+                    watch_user_input();
+                    
                 }
             """
             
@@ -2089,6 +2609,10 @@ class OllamaOnDemandUI(MiscUtils, BuildLeft, BuildRight, BuildMain):
                 fn=lambda : self.chat_history_display(),
                 inputs=[],
                 outputs=[self.gr_main.chatbot]
+            ).then(
+                fn=self.refresh_model_selector,
+                inputs=[],
+                outputs=[self.gr_main.model_dropdown]
             ).then(
                 fn=None,
                 inputs=[],
@@ -19,20 +19,22 @@ def dict_all_models(filter=None):
     page = 1
     
     # Loop all pages until an empty page is found
-    while True:
-        
-        # List models on one page
-        models_page = dict_page_models(page)
-        
-        # If not empty, save; otherwise, break loop
-        if models_page:
-            
-            models = models | models_page
-            page += 1
+    #   (All pages share one session, so requests reuse the connection instead of a new TLS handshake each)
+    with requests.Session() as session:
+        while True:
             
-        else:
+            # List models on one page
+            models_page = dict_page_models(page, session)
             
-            break
+            # If not empty, save; otherwise, break loop
+            if models_page:
+                
+                models = models | models_page
+                page += 1
+                
+            else:
+                
+                break
     
     # Apply filter if provided
     if filter is not None:
@@ -41,19 +43,20 @@ def dict_all_models(filter=None):
     # Return result
     return(models)
 
-def dict_page_models(page):
+def dict_page_models(page, session=requests):
     """
     List all remote models from a page "ollama.com/search?page=[N]" in dictionary form.
     
     Input:
         page:       Page number
+        session:    Session to send requests through (Default: no session, new connection per request)
     Output: 
         models:     Dictionary like {"model_name": ["tag1", "tag2", ...], ...}
     """
         
     # Fetch the HTML content from Ollama model search with given page
     #   * This should only fetch officially maintained model, not user pushed
-    html = requests.get(f"https://ollama.com/search?page={page:d}").text
+    html = session.get(f"https://ollama.com/search?page={page:d}").text
 
     # Extract lines containing listed model names
     #   * Model names are saved in "<span>" tags with "x-test-search-response-title"
@@ -67,7 +70,7 @@ def dict_page_models(page):
     for model_name in lines:
         
         # Fetch model page
-        html = requests.get(f"https://ollama.com/library/{model_name}").text
+        html = session.get(f"https://ollama.com/library/{model_name}").text
 
         # Extract lines containing listed model names
         #  * Model full names (including tags) are saved in "<a href=...>" tags with "font-medium text-neutral-800" classes
@@ -13,7 +13,10 @@ settings_default = {
     
     # Path to Ollama models 
     #   (If non-exists, use default path defined on "--ollama-models" command line argument)
-    "ollama_models": None
+    "ollama_models": None,
+    
+    # Generated chat titles (hash of title model and user messages -> title)
+    "title_cache": {}
     
 }
 